@@ -17,6 +17,7 @@ sshpass -p "fatwoman" ssh -o StrictHostKeyChecking=no "$ORIN" "mkdir -p $ORIN_DI
 echo "Copying files..."
 sshpass -p "fatwoman" scp -o StrictHostKeyChecking=no \
     "$SCRIPT_DIR/pyproject.toml" \
+    "$SCRIPT_DIR/uv.lock" \
     "$SCRIPT_DIR/setup_orin.sh" \
     "$SCRIPT_DIR/install_orin_service.sh" \
     "$ORIN:$ORIN_DIR/"
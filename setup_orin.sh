@@ -21,9 +21,9 @@ export PATH="$HOME/.local/bin:$PATH"
 echo "  uv $(uv --version)"
 
 # Sync project
-echo "[3/3] Syncing project..."
+echo "[3/3] Syncing project (with the 'fast' extra: numba, numpy, orjson)..."
 cd "$(dirname "$0")"
-uv sync
+uv sync --extra fast
 
 # Verify GStreamer NVIDIA plugins
 echo ""
@@ -36,5 +36,5 @@ echo ""
 ffmpeg -version 2>&1 | head -1
 echo ""
 echo "=== Setup complete ==="
-echo "Run with: uv run race-overlay --source webcam --camera-device /dev/video0"
+echo "Run with: uv run --extra fast race-overlay --source webcam --camera-device /dev/video0"
 echo "Auto-start (optional): bash install_orin_service.sh"
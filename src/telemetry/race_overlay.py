@@ -11,45 +11,376 @@ Features:
 from __future__ import annotations
 
 import argparse
+import asyncio
+import base64
+import bisect
+import ctypes
+import fcntl
+import hashlib
+import http.client
 import http.server
+import importlib.util
 import json
 import math
+import mmap
 import os
 import random
+import select
 import signal
 import socket
+import struct
 import subprocess
+import sys
 import threading
 import time
 from functools import partial
 from pathlib import Path
-from typing import Any
-from urllib.error import URLError
-from urllib.parse import urlparse
-from urllib.request import Request, urlopen
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; high-rate telemetry falls back to per-sample ticks.
+    np = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is the fallback encoder.
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels run as plain Python without it.
+
+    def njit(*_args: Any, **_kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        def wrap(func: Callable[..., Any]) -> Callable[..., Any]:
+            return func
+
+        return wrap
+
 
 WEB_DIR = Path(__file__).resolve().parent / "web"
+SSE_MAX_BACKOFF_S = 1.0
+# Most telemetry versions coalesced into one event on a ?batch=1 SSE stream.
+SSE_MAX_BATCH = 8
+# At or above this --telemetry-hz, samples are precomputed in NumPy batches
+# covering TELEMETRY_BATCH_WINDOW_S and then published one per tick.
+TELEMETRY_BATCH_MIN_HZ = 120
+TELEMETRY_BATCH_WINDOW_S = 0.25
+# Rendered frame kernels are written here as modules (one per profile), so Numba's
+# on-disk cache can key on a real source file and skip the JIT across restarts.
+KERNEL_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "4ogs-telemetry" / "kernels"
+_TAU = math.tau
 
 
 def clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
 
 
+def _fixed(value: float, scale: float) -> int:
+    return math.floor(value * scale + 0.5)
+
+
+def _quantize(value: float, scale: float) -> float:
+    # round(value, n) for scale == 10**n (ties round up), without round()'s
+    # correctly-rounded decimal conversion; ~2x cheaper per call.
+    return _fixed(value, scale) / scale
+
+
 def format_secs(value: float) -> str:
     minutes = int(value // 60)
     seconds = value - (minutes * 60)
     return f"{minutes:02d}:{seconds:06.3f}"
 
 
+# Tunable constants of the simulated car/track, baked into the frame kernels as
+# literals when they are generated (see build_frame_kernels).
+SIM_PROFILE: dict[str, float] = {
+    "speed_base": 82.0,
+    "speed_amp_1": 26.0,
+    "speed_freq_1": 1.9,
+    "speed_phase_1": 0.6,
+    "speed_amp_2": 13.0,
+    "speed_freq_2": 5.4,
+    "speed_phase_2": -0.8,
+    "speed_wobble_amp": 4.0,
+    "speed_wobble_freq": 0.9,
+    "speed_min": 24.0,
+    "speed_max": 132.0,
+    "pedal_freq": 2.2,
+    "throttle_base": 0.63,
+    "throttle_amp": 0.33,
+    "throttle_phase": 1.1,
+    "brake_base": 0.18,
+    "brake_amp": 0.25,
+    "brake_phase": -1.2,
+    "brake_lift_throttle": 0.7,
+    "brake_lift_factor": 0.25,
+    "rpm_base": 1700.0,
+    "rpm_per_mph": 61.0,
+    "rpm_per_throttle": 1300.0,
+    "rpm_per_brake": 900.0,
+    "rpm_wobble_amp": 240.0,
+    "rpm_wobble_freq": 8.8,
+    "rpm_min": 1200.0,
+    "rpm_max": 8900.0,
+    "g_lat_amp": 1.55,
+    "g_lat_freq": 3.0,
+    "g_lat_phase": 0.4,
+    "g_lat_limit": 2.0,
+    "g_long_amp": 1.0,
+    "g_long_freq": 2.1,
+    "g_long_phase": -0.8,
+    "g_long_pedal_gain": 0.35,
+    "g_long_limit": 1.6,
+    "delta_base": -0.38,
+    "delta_amp": 0.28,
+    "delta_freq": 0.23,
+}
+
+# Pure numeric core of TelemetrySimulator. Returns
+# (speed_mph, throttle, brake, rpm, g_lat, g_long, track_x, track_y,
+#  predicted_delta, progress, lap_time, since_start).
+# Rendered once per profile and compiled twice: scalar (math, optionally Numba) and
+# vectorized over timestamp arrays (NumPy), via the sin/cos/clip/where bindings.
+_FRAME_KERNEL_TEMPLATE = """
+def compute_frame(now, started, lap_started, lap_target, noise):
+    since_start = now - started
+    lap_time = now - lap_started
+    progress = clip(lap_time / lap_target, 0.0, 1.0)
+    theta = progress * TAU
+
+    speed = {speed_base} + {speed_amp_1} * sin(theta * {speed_freq_1} + {speed_phase_1})
+    speed += {speed_amp_2} * sin(theta * {speed_freq_2} + {speed_phase_2})
+    speed += {speed_wobble_amp} * sin(since_start * {speed_wobble_freq})
+    speed_mph = clip(speed, {speed_min}, {speed_max})
+
+    throttle = clip({throttle_base} + {throttle_amp} * sin(theta * {pedal_freq} + {throttle_phase}), 0.0, 1.0)
+    brake = clip({brake_base} + {brake_amp} * sin(theta * {pedal_freq} + {brake_phase}), 0.0, 1.0)
+    brake = where(throttle > {brake_lift_throttle}, brake * {brake_lift_factor}, brake)
+
+    rpm = {rpm_base} + (speed_mph * {rpm_per_mph}) + (throttle * {rpm_per_throttle}) - (brake * {rpm_per_brake})
+    rpm += {rpm_wobble_amp} * sin(since_start * {rpm_wobble_freq})
+    rpm = clip(rpm, {rpm_min}, {rpm_max})
+
+    g_lat = clip({g_lat_amp} * sin(theta * {g_lat_freq} + {g_lat_phase}), -{g_lat_limit}, {g_lat_limit})
+    g_long = clip(
+        {g_long_amp} * sin(theta * {g_long_freq} + {g_long_phase}) + (throttle - brake) * {g_long_pedal_gain},
+        -{g_long_limit},
+        {g_long_limit},
+    )
+
+    track_x = clip(0.50 + 0.34 * sin(theta) + 0.08 * sin(theta * 3.0 + 0.5), 0.02, 0.98)
+    track_y = clip(0.50 + 0.28 * cos(theta) - 0.10 * sin(theta * 2.0 + 1.3), 0.02, 0.98)
+
+    predicted_delta = {delta_base} + {delta_amp} * sin(since_start * {delta_freq}) + noise
+
+    return (
+        speed_mph,
+        throttle,
+        brake,
+        rpm,
+        g_lat,
+        g_long,
+        track_x,
+        track_y,
+        predicted_delta,
+        progress,
+        lap_time,
+        since_start,
+    )
+"""
+
+
+@njit(cache=True, fastmath=True)
+def _clip_scalar(value: float, low: float, high: float) -> float:
+    return min(max(value, low), high)
+
+
+@njit(cache=True, fastmath=True)
+def _where_scalar(condition: bool, if_true: float, if_false: float) -> float:
+    return if_true if condition else if_false
+
+
+def _kernel_source_file(source: str) -> Path | None:
+    # Named by content hash and never rewritten, since a new mtime would invalidate
+    # Numba's cache for it. None if the cache directory isn't writable.
+    path = KERNEL_CACHE_DIR / f"frame_kernel_{hashlib.sha256(source.encode()).hexdigest()[:16]}.py"
+    if path.exists():
+        return path
+    try:
+        KERNEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_text(source, encoding="utf-8")
+        os.replace(staging, path)
+    except OSError:
+        return None
+    return path
+
+
+def _compile_kernel(source: str, path: Path | None, name: str, bindings: dict[str, Any]) -> Callable[..., Any]:
+    namespace: dict[str, Any] = {"TAU": _TAU, **bindings}
+    if path is None:
+        exec(compile(source, "<frame-kernel>", "exec"), namespace)
+        return namespace["compute_frame"]
+    spec = importlib.util.spec_from_file_location(f"{path.stem}_{name}", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # Bindings are globals the kernel source leaves undefined. Numba resolves the
+    # function's module through sys.modules when it loads a cached build.
+    module.__dict__.update(namespace)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.compute_frame
+
+
+def build_frame_kernels(
+    profile: dict[str, float],
+) -> tuple[Callable[..., tuple[float, ...]], Callable[..., tuple[Any, ...]] | None]:
+    # Profile values become literals in the generated source, so Numba/LLVM (or the
+    # CPython peephole pass) constant-folds them like hand-written numbers.
+    source = _FRAME_KERNEL_TEMPLATE.format(**{name: repr(float(value)) for name, value in profile.items()})
+    path = _kernel_source_file(source)
+    scalar = _compile_kernel(
+        source,
+        path,
+        "scalar",
+        {"sin": math.sin, "cos": math.cos, "clip": _clip_scalar, "where": _where_scalar},
+    )
+    # Without a source file (unwritable cache dir) Numba can't cache and JITs per run.
+    scalar = njit(cache=path is not None, fastmath=True)(scalar)
+    vector = None
+    if np is not None:
+        vector = _compile_kernel(source, path, "vector", {"sin": np.sin, "cos": np.cos, "clip": np.clip, "where": np.where})
+    return scalar, vector
+
+
+def _dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _sse_event(data: bytes, event: bytes = b"telemetry") -> bytes:
+    return b"event: " + event + b"\ndata: " + data + b"\n\n"
+
+
+def _encode_json_batch(payloads: list[bytes]) -> bytes:
+    # Always an array, oldest first, even for a single sample.
+    return _sse_event(b"[" + b",".join(payloads) + b"]", b"telemetry_batch")
+
+
+# Fixed-point little-endian record carrying the fields the HUD renders; decoded by
+# decodePacked() in web/overlay.js, which must change in lockstep (the dashboard
+# checks this against PACKED_PROBE at startup). A packed event carries one or more
+# records back to back, oldest first. Fields, in order:
+# speed_mph*10, rpm, gear index, g_lat*100, g_long*100, throttle*1000, brake*1000,
+# lap number, current/last/best lap ms, predicted delta ms, progress*10000,
+# track x*10000, track y*10000, cpu%*10, gpu%*10, temp C*10, mem%*10.
+# Out-of-range values saturate at the field's limits. Optional system fields use
+# PACKED_NULL_U16 / PACKED_NULL_I16 for None; a gear outside
+# TelemetrySimulator._GEARS is PACKED_GEAR_UNKNOWN.
+PACKED_TELEMETRY = struct.Struct("<HHBhhHHHIIIhHHHHHhH")
+PACKED_NULL_U16 = 0xFFFF
+PACKED_NULL_I16 = -0x8000
+PACKED_GEAR_UNKNOWN = 0xFF
+_U16 = (0, 0xFFFF)
+_I16 = (-0x8000, 0x7FFF)
+_U32 = (0, 0xFFFFFFFF)
+# Nullable fields give up the end of their range that holds the null marker.
+_U16_NULLABLE = (0, PACKED_NULL_U16 - 1)
+_I16_NULLABLE = (PACKED_NULL_I16 + 1, 0x7FFF)
+# Reference sample the dashboard decodes from /api/config before trusting the
+# packed stream; it covers both signs, a null and every scale.
+PACKED_PROBE: dict[str, Any] = {
+    "speed_mph": 87.4,
+    "rpm": 6150,
+    "gear": "4",
+    "g_lat": -1.23,
+    "g_long": 0.45,
+    "throttle": 0.875,
+    "brake": 0.0,
+    "lap": {
+        "number": 3,
+        "current_time_s": 61.234,
+        "last_time_s": 102.5,
+        "best_time_s": 99.875,
+        "predicted_delta_s": -1.25,
+        "progress": 0.4321,
+    },
+    "track": {"x": 0.1234, "y": 0.9876},
+    "system": {"cpu_percent": 42.5, "gpu_percent": None, "temp_c": -3.5, "mem_used_percent": 61.2},
+}
+
+
+def _packed_field(value: float, scale: float, bounds: tuple[int, int]) -> int:
+    # Clamping before the floor also lands NaN and infinities on a bound.
+    return math.floor(clamp(value * scale, *bounds) + 0.5)
+
+
+def _packed_field_or_null(value: float | None, scale: float, bounds: tuple[int, int], null: int) -> int:
+    return null if value is None else _packed_field(value, scale, bounds)
+
+
+def _pack_telemetry(sample: dict[str, Any]) -> bytes:
+    if not sample:
+        return b""
+    lap = sample["lap"]
+    track = sample["track"]
+    system = sample["system"]
+    return PACKED_TELEMETRY.pack(
+        _packed_field(sample["speed_mph"], 10.0, _U16),
+        _packed_field(sample["rpm"], 1.0, _U16),
+        TelemetrySimulator._GEAR_INDEX.get(sample["gear"], PACKED_GEAR_UNKNOWN),
+        _packed_field(sample["g_lat"], 100.0, _I16),
+        _packed_field(sample["g_long"], 100.0, _I16),
+        _packed_field(sample["throttle"], 1000.0, _U16),
+        _packed_field(sample["brake"], 1000.0, _U16),
+        _packed_field(lap["number"], 1.0, _U16),
+        _packed_field(lap["current_time_s"], 1000.0, _U32),
+        _packed_field(lap["last_time_s"], 1000.0, _U32),
+        _packed_field(lap["best_time_s"], 1000.0, _U32),
+        _packed_field(lap["predicted_delta_s"], 1000.0, _I16),
+        _packed_field(lap["progress"], 10000.0, _U16),
+        _packed_field(track["x"], 10000.0, _U16),
+        _packed_field(track["y"], 10000.0, _U16),
+        _packed_field_or_null(system.get("cpu_percent"), 10.0, _U16_NULLABLE, PACKED_NULL_U16),
+        _packed_field_or_null(system.get("gpu_percent"), 10.0, _U16_NULLABLE, PACKED_NULL_U16),
+        _packed_field_or_null(system.get("temp_c"), 10.0, _I16_NULLABLE, PACKED_NULL_I16),
+        _packed_field_or_null(system.get("mem_used_percent"), 10.0, _U16_NULLABLE, PACKED_NULL_U16),
+    )
+
+
+def _encode_packed_batch(records: list[bytes], event: bytes) -> bytes:
+    # SSE is text-only, so the binary records travel base64-encoded.
+    return _sse_event(base64.b64encode(b"".join(records)), event)
+
+
+def _open_proc_file(path: str) -> int | None:
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _read_proc_head(fd: int, size: int) -> bytes:
+    # procfs regenerates the file on every read from offset 0, so one fd can be reused.
+    os.lseek(fd, 0, os.SEEK_SET)
+    return os.read(fd, size)
+
+
 class CpuUsageSampler:
     def __init__(self) -> None:
         self._prev_total = 0
         self._prev_idle = 0
+        self._fd = _open_proc_file("/proc/stat")
 
     def sample(self) -> float | None:
+        if self._fd is None:
+            return None
         try:
-            with open("/proc/stat", "r", encoding="utf-8") as handle:
-                parts = handle.readline().split()
+            buf = _read_proc_head(self._fd, 256)
+            parts = buf[: buf.index(b"\n")].split()
             values = [int(x) for x in parts[1:]]
             idle = values[3] + values[4]
             total = sum(values)
@@ -78,10 +409,20 @@ class SystemStatsSampler:
         "/sys/class/thermal/thermal_zone0/temp",
         "/sys/devices/virtual/thermal/thermal_zone0/temp",
     )
+    STATS_TTL_S = 1.0
+    LOADAVG_TTL_S = 5.0
 
     def __init__(self) -> None:
         self._cpu_sampler = CpuUsageSampler()
-        self._cpu_cores = os.cpu_count() or 1
+        if hasattr(os, "sched_getaffinity"):
+            self._cpu_cores = len(os.sched_getaffinity(0)) or 1
+        else:
+            self._cpu_cores = os.cpu_count() or 1
+        self._meminfo_fd = _open_proc_file("/proc/meminfo")
+        self._last_ts = float("-inf")
+        self._last_stats: dict[str, Any] = {}
+        self._load_ts = float("-inf")
+        self._load_1m = 0.0
 
     def _read_float(self, path: str, scale: float = 1.0) -> float | None:
         try:
@@ -108,37 +449,61 @@ class SystemStatsSampler:
                 return value
         return None
 
+    @staticmethod
+    def _meminfo_kb(buf: bytes, key: bytes) -> int:
+        start = buf.find(key)
+        if start < 0:
+            return 0
+        start += len(key)
+        return int(buf[start : buf.index(b"\n", start)].split()[0])
+
     def _read_mem_used_percent(self) -> float | None:
+        if self._meminfo_fd is None:
+            return None
         try:
-            info: dict[str, int] = {}
-            with open("/proc/meminfo", "r", encoding="utf-8") as handle:
-                for line in handle:
-                    key, rest = line.split(":", maxsplit=1)
-                    info[key] = int(rest.strip().split()[0])
-            total = float(info.get("MemTotal", 0))
-            available = float(info.get("MemAvailable", 0))
+            buf = _read_proc_head(self._meminfo_fd, 2048)
+            total = float(self._meminfo_kb(buf, b"MemTotal:"))
+            available = float(self._meminfo_kb(buf, b"MemAvailable:"))
             if total <= 0:
                 return None
             used_pct = 100.0 * ((total - available) / total)
             return clamp(used_pct, 0.0, 100.0)
-        except (OSError, ValueError):
+        except (OSError, ValueError, IndexError):
             return None
 
     def sample(self) -> dict[str, Any]:
+        # These metrics move slowly; re-read them at most once per STATS_TTL_S.
+        now = time.monotonic()
+        if now - self._last_ts < self.STATS_TTL_S:
+            return self._last_stats
+        self._last_ts = now
+        if now - self._load_ts >= self.LOADAVG_TTL_S:
+            # The kernel only recomputes the load average every 5 seconds.
+            self._load_ts = now
+            self._load_1m = os.getloadavg()[0]
         cpu_percent = self._cpu_sampler.sample()
-        load_1m = os.getloadavg()[0]
-        return {
+        self._last_stats = {
             "cpu_percent": None if cpu_percent is None else round(cpu_percent, 1),
-            "cpu_load_1m": round(load_1m, 2),
+            "cpu_load_1m": round(self._load_1m, 2),
             "cpu_cores": self._cpu_cores,
             "gpu_percent": self._read_gpu_percent(),
             "temp_c": self._read_temp_c(),
             "mem_used_percent": self._read_mem_used_percent(),
         }
+        return self._last_stats
 
 
 class TelemetrySimulator:
-    def __init__(self) -> None:
+    # Upshift speeds (mph): below _GEAR_CUTS[i] the car is in _GEARS[i].
+    _GEAR_CUTS = (18.0, 31.0, 47.0, 70.0, 93.0, 114.0)
+    _GEARS = ("N", "1", "2", "3", "4", "5", "6")
+    _GEAR_INDEX = {gear: index for index, gear in enumerate(_GEARS)}
+
+    def __init__(self, profile: dict[str, float] | None = None) -> None:
+        self._compute_frame, self._compute_frames = build_frame_kernels({**SIM_PROFILE, **(profile or {})})
+        # Compile (or load from Numba's cache) now, with the argument types of a real
+        # call, rather than stalling the first live telemetry tick.
+        self._compute_frame(0.0, 0.0, 0.0, 1.0, 0.0)
         self._started = time.monotonic()
         self._lap = 2
         self._lap_started = self._started
@@ -147,6 +512,8 @@ class TelemetrySimulator:
         self._last_lap_s = 96.401
         self._rng = random.Random(24)
         self._stats = SystemStatsSampler()
+        # Wall-clock offset of the monotonic clock, so one clock read stamps both.
+        self._epoch_anchor = time.time() - time.monotonic()
 
     def _advance_lap_if_needed(self, now: float) -> None:
         elapsed = now - self._lap_started
@@ -161,71 +528,280 @@ class TelemetrySimulator:
     def sample(self) -> dict[str, Any]:
         now = time.monotonic()
         self._advance_lap_if_needed(now)
-        since_start = now - self._started
-        lap_time = now - self._lap_started
-        progress = clamp(lap_time / self._lap_target_s, 0.0, 1.0)
-        theta = progress * math.tau
-
-        speed = 82.0 + 26.0 * math.sin(theta * 1.9 + 0.6)
-        speed += 13.0 * math.sin(theta * 5.4 - 0.8)
-        speed += 4.0 * math.sin(since_start * 0.9)
-        speed_mph = clamp(speed, 24.0, 132.0)
-
-        throttle = clamp(0.63 + 0.33 * math.sin(theta * 2.2 + 1.1), 0.0, 1.0)
-        brake = clamp(0.18 + 0.25 * math.sin(theta * 2.2 - 1.2), 0.0, 1.0)
-        if throttle > 0.7:
-            brake *= 0.25
-
-        rpm = 1700.0 + (speed_mph * 61.0) + (throttle * 1300.0) - (brake * 900.0)
-        rpm += 240.0 * math.sin(since_start * 8.8)
-        rpm = clamp(rpm, 1200.0, 8900.0)
-
-        if speed_mph < 18:
-            gear = "N"
-        elif speed_mph < 31:
-            gear = "1"
-        elif speed_mph < 47:
-            gear = "2"
-        elif speed_mph < 70:
-            gear = "3"
-        elif speed_mph < 93:
-            gear = "4"
-        elif speed_mph < 114:
-            gear = "5"
-        else:
-            gear = "6"
-
-        g_lat = clamp(1.55 * math.sin(theta * 3.0 + 0.4), -2.0, 2.0)
-        g_long = clamp(1.00 * math.sin(theta * 2.1 - 0.8) + (throttle - brake) * 0.35, -1.6, 1.6)
-
-        track_x = clamp(0.50 + 0.34 * math.sin(theta) + 0.08 * math.sin(theta * 3.0 + 0.5), 0.02, 0.98)
-        track_y = clamp(0.50 + 0.28 * math.cos(theta) - 0.10 * math.sin(theta * 2.0 + 1.3), 0.02, 0.98)
+        frame = self._compute_frame(
+            now,
+            self._started,
+            self._lap_started,
+            self._lap_target_s,
+            self._rng.uniform(-0.02, 0.02),
+        )
+        return self._build_sample(now + self._epoch_anchor, frame)
+
+    def sample_batch(self, start_s: float, count: int, interval_s: float) -> list[dict[str, Any]]:
+        # Precompute samples for start_s, start_s + interval_s, ... (monotonic clock)
+        # in one vectorized pass. The batch stops early at the end of the current lap.
+        self._advance_lap_if_needed(start_s)
+        times = start_s + np.arange(count) * interval_s
+        times = times[times - self._lap_started < self._lap_target_s]
+        noise = np.array([self._rng.uniform(-0.02, 0.02) for _ in range(len(times))])
+        columns = self._compute_frames(times, self._started, self._lap_started, self._lap_target_s, noise)
+        epochs = (times + self._epoch_anchor).tolist()
+        return [
+            self._build_sample(epoch_s, frame)
+            for epoch_s, frame in zip(epochs, zip(*(column.tolist() for column in columns)))
+        ]
 
-        predicted_delta = -0.38 + 0.28 * math.sin(since_start * 0.23) + self._rng.uniform(-0.02, 0.02)
+    def _build_sample(self, epoch_s: float, frame: tuple[float, ...]) -> dict[str, Any]:
+        (
+            speed_mph,
+            throttle,
+            brake,
+            rpm,
+            g_lat,
+            g_long,
+            track_x,
+            track_y,
+            predicted_delta,
+            progress,
+            lap_time,
+            since_start,
+        ) = frame
+
+        gear = self._GEARS[bisect.bisect_right(self._GEAR_CUTS, speed_mph)]
 
         return {
-            "ts_epoch_s": time.time(),
-            "speed_mph": round(speed_mph, 1),
+            "ts_epoch_s": epoch_s,
+            "speed_mph": _quantize(speed_mph, 10.0),
             "rpm": int(rpm),
             "gear": gear,
-            "g_lat": round(g_lat, 2),
-            "g_long": round(g_long, 2),
-            "throttle": round(throttle, 3),
-            "brake": round(brake, 3),
+            "g_lat": _quantize(g_lat, 100.0),
+            "g_long": _quantize(g_long, 100.0),
+            "throttle": _quantize(throttle, 1000.0),
+            "brake": _quantize(brake, 1000.0),
             "lap": {
                 "number": self._lap,
-                "current_time_s": round(lap_time, 3),
-                "last_time_s": round(self._last_lap_s, 3),
-                "best_time_s": round(self._best_lap_s, 3),
-                "predicted_delta_s": round(predicted_delta, 3),
-                "progress": round(progress, 4),
+                "current_time_s": _quantize(lap_time, 1000.0),
+                "last_time_s": _quantize(self._last_lap_s, 1000.0),
+                "best_time_s": _quantize(self._best_lap_s, 1000.0),
+                "predicted_delta_s": _quantize(predicted_delta, 1000.0),
+                "progress": _quantize(progress, 10000.0),
             },
-            "track": {"x": round(track_x, 4), "y": round(track_y, 4)},
+            "track": {"x": _quantize(track_x, 10000.0), "y": _quantize(track_y, 10000.0)},
             "system": self._stats.sample(),
             "meta": {"source": "simulated", "updated_at": format_secs(since_start)},
         }
 
 
+def _fourcc(code: str) -> int:
+    return ord(code[0]) | (ord(code[1]) << 8) | (ord(code[2]) << 16) | (ord(code[3]) << 24)
+
+
+class _V4L2PixFormat(ctypes.Structure):
+    _fields_ = [
+        ("width", ctypes.c_uint32),
+        ("height", ctypes.c_uint32),
+        ("pixelformat", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("bytesperline", ctypes.c_uint32),
+        ("sizeimage", ctypes.c_uint32),
+        ("colorspace", ctypes.c_uint32),
+        ("priv", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("ycbcr_enc", ctypes.c_uint32),
+        ("quantization", ctypes.c_uint32),
+        ("xfer_func", ctypes.c_uint32),
+    ]
+
+
+class _V4L2FormatUnion(ctypes.Union):
+    # The kernel union also holds pointer-bearing structs, hence the c_void_p alignment member.
+    _fields_ = [("pix", _V4L2PixFormat), ("raw_data", ctypes.c_uint8 * 200), ("_align", ctypes.c_void_p)]
+
+
+class _V4L2Format(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("fmt", _V4L2FormatUnion)]
+
+
+class _V4L2Fract(ctypes.Structure):
+    _fields_ = [("numerator", ctypes.c_uint32), ("denominator", ctypes.c_uint32)]
+
+
+class _V4L2CaptureParm(ctypes.Structure):
+    _fields_ = [
+        ("capability", ctypes.c_uint32),
+        ("capturemode", ctypes.c_uint32),
+        ("timeperframe", _V4L2Fract),
+        ("extendedmode", ctypes.c_uint32),
+        ("readbuffers", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 4),
+    ]
+
+
+class _V4L2StreamParmUnion(ctypes.Union):
+    _fields_ = [("capture", _V4L2CaptureParm), ("raw_data", ctypes.c_uint8 * 200)]
+
+
+class _V4L2StreamParm(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint32), ("parm", _V4L2StreamParmUnion)]
+
+
+class _V4L2RequestBuffers(ctypes.Structure):
+    _fields_ = [
+        ("count", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("capabilities", ctypes.c_uint32),
+        ("reserved", ctypes.c_uint32 * 1),
+    ]
+
+
+class _V4L2Timecode(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("frames", ctypes.c_uint8),
+        ("seconds", ctypes.c_uint8),
+        ("minutes", ctypes.c_uint8),
+        ("hours", ctypes.c_uint8),
+        ("userbits", ctypes.c_uint8 * 4),
+    ]
+
+
+class _Timeval(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_usec", ctypes.c_long)]
+
+
+class _V4L2BufferM(ctypes.Union):
+    _fields_ = [
+        ("offset", ctypes.c_uint32),
+        ("userptr", ctypes.c_ulong),
+        ("planes", ctypes.c_void_p),
+        ("fd", ctypes.c_int32),
+    ]
+
+
+class _V4L2Buffer(ctypes.Structure):
+    _fields_ = [
+        ("index", ctypes.c_uint32),
+        ("type", ctypes.c_uint32),
+        ("bytesused", ctypes.c_uint32),
+        ("flags", ctypes.c_uint32),
+        ("field", ctypes.c_uint32),
+        ("timestamp", _Timeval),
+        ("timecode", _V4L2Timecode),
+        ("sequence", ctypes.c_uint32),
+        ("memory", ctypes.c_uint32),
+        ("m", _V4L2BufferM),
+        ("length", ctypes.c_uint32),
+        ("reserved2", ctypes.c_uint32),
+        ("request_fd", ctypes.c_int32),
+    ]
+
+
+def _vidioc(direction: int, nr: int, size: int) -> int:
+    # _IOC() from <asm-generic/ioctl.h>: dir:2 | size:14 | type:8 | nr:8, type 'V'.
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+
+_IOC_WRITE = 1
+_IOC_READWRITE = 3
+VIDIOC_S_FMT = _vidioc(_IOC_READWRITE, 5, ctypes.sizeof(_V4L2Format))
+VIDIOC_REQBUFS = _vidioc(_IOC_READWRITE, 8, ctypes.sizeof(_V4L2RequestBuffers))
+VIDIOC_QUERYBUF = _vidioc(_IOC_READWRITE, 9, ctypes.sizeof(_V4L2Buffer))
+VIDIOC_QBUF = _vidioc(_IOC_READWRITE, 15, ctypes.sizeof(_V4L2Buffer))
+VIDIOC_DQBUF = _vidioc(_IOC_READWRITE, 17, ctypes.sizeof(_V4L2Buffer))
+VIDIOC_STREAMON = _vidioc(_IOC_WRITE, 18, ctypes.sizeof(ctypes.c_int))
+VIDIOC_STREAMOFF = _vidioc(_IOC_WRITE, 19, ctypes.sizeof(ctypes.c_int))
+VIDIOC_S_PARM = _vidioc(_IOC_READWRITE, 22, ctypes.sizeof(_V4L2StreamParm))
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_MEMORY_MMAP = 1
+V4L2_FIELD_ANY = 0
+V4L2_PIX_FMT_MJPEG = _fourcc("MJPG")
+# Direct capture hands the webcam over to ffmpeg if it delivers nothing for this long.
+DIRECT_CAPTURE_STALL_S = 3.0
+
+
+class V4L2Source:
+    # Captures MJPEG frames straight from a V4L2 device through mmap'd driver
+    # buffers, for cameras that encode MJPEG themselves (no ffmpeg in between).
+
+    def __init__(self, device: str, width: int, height: int, fps: int, buffer_count: int = 4) -> None:
+        self._device = device
+        self._width = width
+        self._height = height
+        self._fps = fps
+        self._buffer_count = buffer_count
+        self._fd: int | None = None
+        self._buffers: list[mmap.mmap] = []
+
+    def open(self) -> None:
+        # Raises OSError if the device can't be driven, ValueError if it
+        # can't deliver MJPEG at the requested size.
+        self._fd = os.open(self._device, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            self._configure()
+        except BaseException:
+            self.close()
+            raise
+
+    def _configure(self) -> None:
+        assert self._fd is not None
+        fmt = _V4L2Format(type=V4L2_BUF_TYPE_VIDEO_CAPTURE)
+        fmt.fmt.pix.width = self._width
+        fmt.fmt.pix.height = self._height
+        fmt.fmt.pix.pixelformat = V4L2_PIX_FMT_MJPEG
+        fmt.fmt.pix.field = V4L2_FIELD_ANY
+        fcntl.ioctl(self._fd, VIDIOC_S_FMT, fmt)
+        pix = fmt.fmt.pix
+        if pix.pixelformat != V4L2_PIX_FMT_MJPEG or (pix.width, pix.height) != (self._width, self._height):
+            raise ValueError(f"{self._device} has no native MJPEG mode at {self._width}x{self._height}")
+
+        parm = _V4L2StreamParm(type=V4L2_BUF_TYPE_VIDEO_CAPTURE)
+        parm.parm.capture.timeperframe.numerator = 1
+        parm.parm.capture.timeperframe.denominator = self._fps
+        try:
+            fcntl.ioctl(self._fd, VIDIOC_S_PARM, parm)
+        except OSError:
+            pass  # Not every driver lets us pick the frame rate; take its default.
+
+        req = _V4L2RequestBuffers(count=self._buffer_count, type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP)
+        fcntl.ioctl(self._fd, VIDIOC_REQBUFS, req)
+        for index in range(req.count):
+            buf = _V4L2Buffer(index=index, type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP)
+            fcntl.ioctl(self._fd, VIDIOC_QUERYBUF, buf)
+            self._buffers.append(mmap.mmap(self._fd, buf.length, mmap.MAP_SHARED, mmap.PROT_READ, offset=buf.m.offset))
+            fcntl.ioctl(self._fd, VIDIOC_QBUF, buf)
+        fcntl.ioctl(self._fd, VIDIOC_STREAMON, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+
+    def read_frame(self, timeout_s: float) -> bytes | None:
+        assert self._fd is not None
+        if not select.select([self._fd], [], [], timeout_s)[0]:
+            return None
+        buf = _V4L2Buffer(type=V4L2_BUF_TYPE_VIDEO_CAPTURE, memory=V4L2_MEMORY_MMAP)
+        try:
+            fcntl.ioctl(self._fd, VIDIOC_DQBUF, buf)
+        except BlockingIOError:
+            return None
+        try:
+            # One copy out of the driver buffer so it can be handed straight back.
+            return self._buffers[buf.index][: buf.bytesused]
+        finally:
+            fcntl.ioctl(self._fd, VIDIOC_QBUF, buf)
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            fcntl.ioctl(self._fd, VIDIOC_STREAMOFF, ctypes.c_int(V4L2_BUF_TYPE_VIDEO_CAPTURE))
+        except OSError:
+            pass
+        for buffer in self._buffers:
+            buffer.close()
+        self._buffers = []
+        os.close(self._fd)
+        self._fd = None
+
+
 class CameraStreamer:
     def __init__(
         self,
@@ -239,6 +815,8 @@ class CameraStreamer:
         fps: int,
         camera_port: int,
         jpeg_quality: int,
+        broker: CameraBroker,
+        direct_capture: bool,
     ) -> None:
         self._running = running
         self._source = source
@@ -250,9 +828,12 @@ class CameraStreamer:
         self._fps = fps
         self._camera_port = camera_port
         self._jpeg_quality = jpeg_quality
+        self._broker = broker
+        self._direct_capture = direct_capture
         self._thread: threading.Thread | None = None
         self._proc: subprocess.Popen[str] | None = None
         self._lock = threading.Lock()
+        # Only _run_loop writes _status, always by swapping in a new dict.
         self._status: dict[str, Any] = {
             "running": False,
             "restarts": 0,
@@ -260,6 +841,33 @@ class CameraStreamer:
             "last_exit_code": None,
         }
 
+    def _camera_supports_native_mjpeg(self) -> bool:
+        # Ask v4l2-ctl whether the camera can emit MJPEG at the requested mode itself.
+        try:
+            result = subprocess.run(
+                ["v4l2-ctl", "--device", self._camera_device, "--list-formats-ext"],
+                capture_output=True,
+                text=True,
+                timeout=3,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return False
+        size = f"{self._width}x{self._height}"
+        fps = f"({self._fps:.3f} fps)"
+        in_mjpeg = False
+        size_match = False
+        for line in result.stdout.splitlines():
+            line = line.strip()
+            if line.startswith("["):
+                in_mjpeg = "'MJPG'" in line
+                size_match = False
+            elif line.startswith("Size:"):
+                size_match = in_mjpeg and line.split()[-1] == size
+            elif line.startswith("Interval:") and size_match and line.endswith(fps):
+                return True
+        return False
+
     def _build_cmd(self) -> list[str]:
         cmd = [
             "ffmpeg",
@@ -273,10 +881,19 @@ class CameraStreamer:
             "-thread_queue_size",
             "1024",
         ]
+        passthrough = self._source == "webcam" and self._camera_supports_native_mjpeg()
         if self._source == "webcam":
             cmd += [
+                "-probesize",
+                "32",
+                "-analyzeduration",
+                "0",
                 "-f",
                 "v4l2",
+            ]
+            if passthrough:
+                cmd += ["-input_format", "mjpeg"]
+            cmd += [
                 "-framerate",
                 str(self._fps),
                 "-video_size",
@@ -294,20 +911,34 @@ class CameraStreamer:
             ]
         else:
             cmd += [
+                "-probesize",
+                "32",
+                "-analyzeduration",
+                "0",
                 "-f",
                 "lavfi",
                 "-i",
                 f"testsrc2=size={self._width}x{self._height}:rate={self._fps}",
             ]
 
+        if passthrough:
+            # Camera already delivers MJPEG at the requested mode: skip decode/scale/encode.
+            cmd += [
+                "-an",
+                "-c:v",
+                "copy",
+            ]
+        else:
+            cmd += [
+                "-vf",
+                f"scale={self._width}:{self._height}:flags=lanczos,fps={self._fps}",
+                "-an",
+                "-c:v",
+                "mjpeg",
+                "-q:v",
+                str(self._jpeg_quality),
+            ]
         cmd += [
-            "-vf",
-            f"scale={self._width}:{self._height}:flags=lanczos,fps={self._fps}",
-            "-an",
-            "-c:v",
-            "mjpeg",
-            "-q:v",
-            str(self._jpeg_quality),
             "-f",
             "mpjpeg",
             "-listen",
@@ -335,27 +966,39 @@ class CameraStreamer:
 
     def _run_loop(self) -> None:
         if self._source == "mjpeg":
-            with self._lock:
-                self._status["running"] = bool(self._mjpeg_url)
-                self._status["last_error"] = ""
-                self._status["last_exit_code"] = None
+            self._status = {
+                **self._status,
+                "running": bool(self._mjpeg_url),
+                "last_error": "",
+                "last_exit_code": None,
+            }
             while self._running.is_set():
                 time.sleep(0.5)
-            with self._lock:
-                self._status["running"] = False
+            self._status = {**self._status, "running": False}
             return
 
+        if self._source == "webcam" and self._direct_capture:
+            if self._run_direct_loop():
+                return
+            # ffmpeg clears last_error when it starts, so leave a trace in the log.
+            print(f"{self._status['last_error']}; falling back to ffmpeg", flush=True)
+
+        # The arguments never change between restarts (and building them may probe
+        # the camera), so build them once.
+        cmd = self._build_cmd()
         while self._running.is_set():
-            cmd = self._build_cmd()
+            self._status = {**self._status, "running": True, "last_error": ""}
             with self._lock:
-                self._status["running"] = True
-                self._status["last_error"] = ""
+                # Our fds are non-inheritable (PEP 446), so skip the close-all sweep on
+                # spawn; its own session keeps terminal signals off ffmpeg, stop() ends it.
                 self._proc = subprocess.Popen(
                     cmd,
                     stdout=subprocess.DEVNULL,
                     stderr=subprocess.PIPE,
                     text=True,
                     bufsize=1,
+                    close_fds=False,
+                    start_new_session=True,
                 )
                 proc = self._proc
 
@@ -370,21 +1013,293 @@ class CameraStreamer:
 
             exit_code = proc.wait()
             with self._lock:
-                self._status["running"] = False
-                self._status["last_exit_code"] = exit_code
-                if last_stderr:
-                    self._status["last_error"] = last_stderr
-                if self._running.is_set():
-                    self._status["restarts"] += 1
                 self._proc = None
+            status = self._status
+            self._status = {
+                "running": False,
+                "restarts": status["restarts"] + (1 if self._running.is_set() else 0),
+                "last_error": last_stderr or status["last_error"],
+                "last_exit_code": exit_code,
+            }
 
             if not self._running.is_set():
                 break
             time.sleep(0.8)
 
+    def _run_direct_loop(self) -> bool:
+        # Returns False when direct capture can't carry the stream: the device won't
+        # open, no frame arrives for DIRECT_CAPTURE_STALL_S, or a read fails. The
+        # caller then falls back to ffmpeg for the rest of the run.
+        source = V4L2Source(self._camera_device, self._width, self._height, self._fps)
+        try:
+            source.open()
+        except (OSError, ValueError) as exc:
+            self._status = {**self._status, "last_error": f"direct capture: {exc}"}
+            return False
+        self._broker.set_direct(True)
+        error = ""
+        last_frame_at = time.monotonic()
+        try:
+            while self._running.is_set():
+                frame = source.read_frame(0.5)
+                if frame:
+                    self._broker.publish(frame)
+                    last_frame_at = time.monotonic()
+                    if not self._status["running"]:
+                        self._status = {**self._status, "running": True, "last_error": "", "last_exit_code": None}
+                elif time.monotonic() - last_frame_at > DIRECT_CAPTURE_STALL_S:
+                    error = f"direct capture: no frame for {DIRECT_CAPTURE_STALL_S:.0f}s"
+                    break
+        except OSError as exc:
+            error = f"direct capture: {exc}"
+        finally:
+            source.close()
+            self._broker.set_direct(False)
+        status = self._status
+        self._status = {**status, "running": False, "last_error": error or status["last_error"]}
+        return not error
+
     def status(self) -> dict[str, Any]:
-        with self._lock:
-            return dict(self._status)
+        return self._status
+
+
+def _multipart_boundary(content_type: str) -> str:
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary":
+            return value.strip('"')
+    return CameraBroker.BOUNDARY
+
+
+class CameraBroker:
+    BOUNDARY = "ffmpeg"
+
+    def __init__(self, running: threading.Event, upstream_url: str, connect_timeout_s: float) -> None:
+        self._running = running
+        self._upstream_url = upstream_url
+        self._connect_timeout_s = connect_timeout_s
+        self._thread: threading.Thread | None = None
+        self._subscribers_lock = threading.Lock()
+        self._subscribers: tuple[Callable[[], None], ...] = ()
+        # (sequence, encoded multipart part); swapped wholesale on each frame.
+        self._part: tuple[int, bytes] = (0, b"")
+        # Set while an in-process source (V4L2Source) publishes frames, so the
+        # upstream HTTP reader stands down.
+        self._direct = threading.Event()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def subscribe(self, callback: Callable[[], None]) -> None:
+        # Callbacks run on the broker thread for every new frame and must not block.
+        with self._subscribers_lock:
+            self._subscribers = self._subscribers + (callback,)
+
+    def unsubscribe(self, callback: Callable[[], None]) -> None:
+        with self._subscribers_lock:
+            self._subscribers = tuple(sub for sub in self._subscribers if sub != callback)
+
+    def set_direct(self, active: bool) -> None:
+        if active:
+            self._direct.set()
+        else:
+            self._direct.clear()
+            self._part = (self._part[0], b"")
+
+    def wait_for_frame(self, timeout_s: float) -> bool:
+        if self._part[1]:
+            return True
+        wakeup = threading.Event()
+        self.subscribe(wakeup.set)
+        try:
+            return bool(self._part[1]) or wakeup.wait(timeout_s)
+        finally:
+            self.unsubscribe(wakeup.set)
+
+    def latest_part(self) -> tuple[int, bytes]:
+        return self._part
+
+    def publish(self, jpeg: bytes) -> None:
+        header = f"--{self.BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n"
+        self._part = (self._part[0] + 1, header.encode("ascii") + jpeg + b"\r\n")
+        for callback in self._subscribers:
+            callback()
+
+    def _open_upstream(self) -> tuple[http.client.HTTPConnection, str]:
+        url = urlparse(self._upstream_url)
+        timeout = self._connect_timeout_s
+        if url.scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(url.netloc, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(url.netloc, timeout=timeout)
+        target = url.path or "/"
+        if url.query:
+            target += f"?{url.query}"
+        return conn, target
+
+    def _run_loop(self) -> None:
+        # The HTTPConnection object is reused, but each attempt closes the socket (an
+        # ended MJPEG response can't carry another request), so every reconnect is a
+        # fresh TCP connect bounded by connect_timeout_s. Built inside the retry loop
+        # so a malformed URL fails each attempt instead of killing the thread. Unlike
+        # urlopen, http.client ignores the *_proxy environment variables.
+        upstream: tuple[http.client.HTTPConnection, str] | None = None
+        while self._running.is_set():
+            if self._direct.is_set():
+                time.sleep(0.5)
+                continue
+            try:
+                if upstream is None:
+                    upstream = self._open_upstream()
+                conn, target = upstream
+                conn.request("GET", target)
+                response = conn.getresponse()
+                if response.status == 200:
+                    if conn.sock is not None:
+                        conn.sock.settimeout(8.0)
+                    self._read_parts(response)
+            except (OSError, http.client.HTTPException, ValueError):
+                pass
+            finally:
+                if upstream is not None:
+                    upstream[0].close()
+            # Don't hand a frozen frame to viewers that join while upstream is down.
+            self._part = (self._part[0], b"")
+            time.sleep(0.5)
+
+    def _read_parts(self, response: Any) -> None:
+        marker = b"--" + _multipart_boundary(response.headers.get("Content-Type", "")).encode("ascii")
+        line = response.readline()
+        while self._running.is_set() and line:
+            if not line.startswith(marker):
+                line = response.readline()
+                continue
+            length: int | None = None
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                if not line.strip():
+                    break
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if length is not None:
+                jpeg = response.read(length)
+                if len(jpeg) < length:
+                    return
+                line = response.readline()
+            else:
+                chunks: list[bytes] = []
+                line = response.readline()
+                while line and not line.startswith(marker):
+                    chunks.append(line)
+                    line = response.readline()
+                jpeg = b"".join(chunks).removesuffix(b"\r\n")
+            if jpeg:
+                self.publish(jpeg)
+
+
+class StreamHub:
+    # Owns every long-lived SSE / MJPEG client socket once its request handler has
+    # sent the response headers, multiplexing them all on one asyncio event loop
+    # instead of parking an OS thread per viewer.
+
+    def __init__(
+        self,
+        running: threading.Event,
+        camera_broker: CameraBroker,
+    ) -> None:
+        self._running = running
+        self._camera_broker = camera_broker
+        self._loop = asyncio.new_event_loop()
+        self._thread: threading.Thread | None = None
+        # Replaced after every camera frame; coroutines wait on the one they grabbed.
+        self._frame_ready = asyncio.Event()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self._camera_broker.subscribe(self._notify_frame)
+
+    def stop(self) -> None:
+        self._camera_broker.unsubscribe(self._notify_frame)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def serve_sse(self, sock: socket.socket, interval_s: float, source: Callable[[int], tuple[int, bytes]]) -> None:
+        asyncio.run_coroutine_threadsafe(self._serve(sock, self._sse_stream, interval_s, source), self._loop)
+
+    def serve_mjpeg(self, sock: socket.socket) -> None:
+        asyncio.run_coroutine_threadsafe(self._serve(sock, self._mjpeg_stream), self._loop)
+
+    def _notify_frame(self) -> None:
+        self._loop.call_soon_threadsafe(self._fire_frame_ready)
+
+    def _fire_frame_ready(self) -> None:
+        fired = self._frame_ready
+        self._frame_ready = asyncio.Event()
+        fired.set()
+
+    async def _serve(self, sock: socket.socket, stream: Callable[..., Any], *args: Any) -> None:
+        try:
+            _, writer = await asyncio.open_connection(sock=sock)
+        except OSError:
+            sock.close()
+            return
+        # No user-space buffering: drain() returns only once the kernel took the bytes,
+        # so its duration measures client backpressure.
+        writer.transport.set_write_buffer_limits(high=0)
+        try:
+            await stream(writer, *args)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+    async def _sse_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        interval_s: float,
+        source: Callable[[int], tuple[int, bytes]],
+    ) -> None:
+        last_sent = -1
+        # Seconds of extra delay owed by this client, at most SSE_MAX_BACKOFF_S. Blocked
+        # writes grow it and stretch the send interval; writes that finish within
+        # budget drain it by the time that passed since the previous write.
+        penalty_s = 0.0
+        last_write_at = time.monotonic()
+        while self._running.is_set():
+            version, frame = source(last_sent)
+            if version != last_sent:
+                # Only sent once a new version exists, so a fast SSE rate never repeats one.
+                write_started = time.monotonic()
+                writer.write(frame)
+                await writer.drain()
+                last_sent = version
+                write_ended = time.monotonic()
+                write_s = write_ended - write_started
+                if write_s > interval_s * 0.5:
+                    penalty_s = min(penalty_s + write_s, SSE_MAX_BACKOFF_S)
+                else:
+                    penalty_s = max(0.0, penalty_s - (write_started - last_write_at))
+                last_write_at = write_ended
+            await asyncio.sleep(interval_s + penalty_s)
+
+    async def _mjpeg_stream(self, writer: asyncio.StreamWriter) -> None:
+        last_seq = -1
+        while self._running.is_set():
+            frame_ready = self._frame_ready
+            seq, part = self._camera_broker.latest_part()
+            if seq != last_seq and part:
+                writer.write(part)
+                await writer.drain()
+                last_seq = seq
+            # Frames published while a slow client is draining are simply skipped.
+            try:
+                await asyncio.wait_for(frame_ready.wait(), 8.0)
+            except asyncio.TimeoutError:
+                return
 
 
 class OverlayApp:
@@ -392,9 +1307,25 @@ class OverlayApp:
         self.args = args
         self.running = threading.Event()
         self.running.set()
-        self._telemetry_lock = threading.Lock()
-        self._telemetry: dict[str, Any] = {}
-        self._sim = TelemetrySimulator()
+        # (version, sample, history) published by reference swap; never mutated after
+        # publish. history holds (version, json, packed record) for the last
+        # SSE_MAX_BATCH versions, oldest first.
+        self._published: tuple[int, dict[str, Any], tuple[tuple[int, bytes, bytes], ...]] = (
+            0,
+            {},
+            ((0, _dumps({}), b""),),
+        )
+        # Packed records are only built once something can consume them: the
+        # dashboard is configured for them, or a client asked for ?fmt=packed.
+        self._pack_records = args.telemetry_format == "packed"
+        self._sim = TelemetrySimulator(profile=args.sim_profile)
+        self._camera_broker = CameraBroker(
+            running=self.running,
+            upstream_url=self.camera_upstream_url(),
+            # Loopback ffmpeg answers at once, so a short timeout spots its restarts
+            # quickly; a remote camera gets room for DNS, TLS and slow headers.
+            connect_timeout_s=8.0 if args.source == "mjpeg" else 1.0,
+        )
         self._camera = CameraStreamer(
             running=self.running,
             source=args.source,
@@ -406,29 +1337,87 @@ class OverlayApp:
             fps=args.fps,
             camera_port=args.camera_port,
             jpeg_quality=args.jpeg_quality,
+            broker=self._camera_broker,
+            direct_capture=args.webcam_capture == "direct",
+        )
+        self.streams = StreamHub(
+            running=self.running,
+            camera_broker=self._camera_broker,
         )
         self._telemetry_thread: threading.Thread | None = None
 
     def start(self) -> None:
         self._camera.start()
+        self._camera_broker.start()
+        self.streams.start()
         self._telemetry_thread = threading.Thread(target=self._telemetry_loop, daemon=True)
         self._telemetry_thread.start()
 
     def stop(self) -> None:
         self.running.clear()
         self._camera.stop()
+        self.streams.stop()
+
+    def _publish(self, sample: dict[str, Any]) -> None:
+        version, _, history = self._published
+        entry = (version + 1, _dumps(sample), _pack_telemetry(sample) if self._pack_records else b"")
+        self._published = (version + 1, sample, (history + (entry,))[-SSE_MAX_BATCH:])
 
     def _telemetry_loop(self) -> None:
         delay_s = 1.0 / float(self.args.telemetry_hz)
+        if np is not None and self.args.telemetry_hz >= TELEMETRY_BATCH_MIN_HZ:
+            self._batched_telemetry_loop(delay_s)
+            return
         while self.running.is_set():
-            sample = self._sim.sample()
-            with self._telemetry_lock:
-                self._telemetry = sample
+            self._publish(self._sim.sample())
             time.sleep(delay_s)
 
+    def _batched_telemetry_loop(self, delay_s: float) -> None:
+        batch_size = max(1, int(TELEMETRY_BATCH_WINDOW_S / delay_s))
+        # Each batch starts one delay_s after the previous batch's last sample.
+        batch_started = time.monotonic()
+        while self.running.is_set():
+            if time.monotonic() - batch_started > TELEMETRY_BATCH_WINDOW_S:
+                # Fell a whole window behind (e.g. the host stalled): resume from now
+                # rather than bursting out stale samples.
+                batch_started = time.monotonic()
+            batch = self._sim.sample_batch(batch_started, batch_size, delay_s)
+            for index, sample in enumerate(batch):
+                if not self.running.is_set():
+                    return
+                # Sleep to each sample's scheduled time so the drip doesn't drift.
+                time.sleep(max(0.0, batch_started + (index * delay_s) - time.monotonic()))
+                self._publish(sample)
+            batch_started += len(batch) * delay_s
+
     def latest_telemetry(self) -> dict[str, Any]:
-        with self._telemetry_lock:
-            return dict(self._telemetry)
+        return self._published[1]
+
+    def enable_packed(self) -> None:
+        self._pack_records = True
+
+    def sse_frame_since(self, last_sent: int, packed: bool = False, batch: bool = False) -> tuple[int, bytes]:
+        # Returns (current version, SSE event for the client); the event is empty when
+        # the client is already up to date. Plain streams carry the newest sample as
+        # event "telemetry"; batch streams carry every version after last_sent (up to
+        # SSE_MAX_BATCH) as event "telemetry_batch". Either way a new client gets just
+        # the newest sample rather than a burst of stale ones.
+        version, _, history = self._published
+        if version == last_sent:
+            return version, b""
+        if batch and last_sent >= 0:
+            pending = [entry for entry in history if entry[0] > last_sent]
+        else:
+            pending = [history[-1]]
+        if packed:
+            # Versions published before the first packed client have no record.
+            records = [record for _, _, record in pending if record]
+            if not records:
+                return last_sent, b""
+            return version, _encode_packed_batch(records, b"telemetry_batch" if batch else b"telemetry")
+        if batch:
+            return version, _encode_json_batch([payload for _, payload, _ in pending])
+        return version, _sse_event(pending[0][1])
 
     def status(self) -> dict[str, Any]:
         return {
@@ -444,29 +1433,17 @@ class OverlayApp:
             return self.args.mjpeg_url
         return f"http://127.0.0.1:{self.args.camera_port}/live.mjpg"
 
-    def camera_proxy(self, handler: http.server.BaseHTTPRequestHandler) -> None:
-        upstream = self.camera_upstream_url()
-        req = Request(upstream, headers={"Connection": "close"})
-        try:
-            with urlopen(req, timeout=8) as response:
-                ctype = response.headers.get("Content-Type", "")
-                if "multipart/x-mixed-replace" not in ctype.lower():
-                    ctype = "multipart/x-mixed-replace; boundary=ffmpeg"
-                handler.send_response(200)
-                handler.send_header("Content-Type", ctype)
-                handler.send_header("Cache-Control", "no-cache")
-                handler.send_header("Pragma", "no-cache")
-                handler.end_headers()
-                while self.running.is_set():
-                    chunk = response.read(16384)
-                    if not chunk:
-                        break
-                    handler.wfile.write(chunk)
-                    handler.wfile.flush()
-        except (BrokenPipeError, ConnectionResetError):
-            return
-        except (OSError, URLError):
+    def camera_proxy(self, handler: OverlayRequestHandler) -> None:
+        if not self._camera_broker.wait_for_frame(8.0):
             handler.send_error(503, "Camera stream unavailable")
+            return
+        handler.send_response(200)
+        handler.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={CameraBroker.BOUNDARY}")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Pragma", "no-cache")
+        handler.send_header("X-Accel-Buffering", "no")
+        handler.end_headers()
+        self.streams.serve_mjpeg(handler.detach())
 
 
 class OverlayHTTPServer(http.server.ThreadingHTTPServer):
@@ -480,6 +1457,24 @@ class OverlayHTTPServer(http.server.ThreadingHTTPServer):
     ) -> None:
         super().__init__(server_address, request_handler)
         self.app = app
+        self._detached: set[Any] = set()
+
+    def finish_request(self, request: Any, client_address: Any) -> None:
+        # SSE events and MJPEG parts are small, latency-sensitive writes: don't let
+        # Nagle hold them back waiting for an ACK.
+        request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        request.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 65536)
+        super().finish_request(request, client_address)
+
+    def detach_request(self, request: Any) -> None:
+        self._detached.add(request)
+
+    def shutdown_request(self, request: Any) -> None:
+        # Detached sockets now belong to the StreamHub, which closes them itself.
+        if request in self._detached:
+            self._detached.discard(request)
+            return
+        super().shutdown_request(request)
 
 
 class OverlayRequestHandler(http.server.SimpleHTTPRequestHandler):
@@ -493,7 +1488,7 @@ class OverlayRequestHandler(http.server.SimpleHTTPRequestHandler):
         return server.app
 
     def _json(self, payload: dict[str, Any], status: int = 200) -> None:
-        body = json.dumps(payload).encode("utf-8")
+        body = _dumps(payload)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
         self.send_header("Cache-Control", "no-cache")
@@ -501,33 +1496,47 @@ class OverlayRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(body)
 
+    def detach(self) -> socket.socket:
+        server = self.server
+        assert isinstance(server, OverlayHTTPServer)
+        server.detach_request(self.connection)
+        self.close_connection = True
+        return self.connection
+
     def _handle_sse(self) -> None:
         self.send_response(200)
         self.send_header("Content-Type", "text/event-stream")
         self.send_header("Cache-Control", "no-cache")
         self.send_header("Connection", "keep-alive")
+        self.send_header("X-Accel-Buffering", "no")
         self.end_headers()
         interval_s = 1.0 / max(1.0, float(self.app.args.sse_hz))
-        try:
-            while self.app.running.is_set():
-                payload = self.app.latest_telemetry()
-                msg = f"event: telemetry\ndata: {json.dumps(payload)}\n\n"
-                self.wfile.write(msg.encode("utf-8"))
-                self.wfile.flush()
-                time.sleep(interval_s)
-        except (BrokenPipeError, ConnectionResetError):
-            return
+        query = parse_qs(urlparse(self.path).query)
+        packed = query.get("fmt", ["json"])[0] == "packed"
+        if packed:
+            self.app.enable_packed()
+        source = partial(self.app.sse_frame_since, packed=packed, batch=query.get("batch", ["0"])[0] == "1")
+        self.app.streams.serve_sse(self.detach(), interval_s, source)
 
     def do_GET(self) -> None:
         path = urlparse(self.path).path
 
         if path == "/api/config":
+            telemetry_url = "/api/telemetry/stream?batch=1"
+            if self.app.args.telemetry_format == "packed":
+                telemetry_url += "&fmt=packed"
             self._json(
                 {
                     "camera_url": "/camera/live.mjpg",
-                    "telemetry_url": "/api/telemetry/stream",
+                    "telemetry_url": telemetry_url,
+                    "telemetry_format": self.app.args.telemetry_format,
+                    "packed_probe": {
+                        "sample": PACKED_PROBE,
+                        "data": base64.b64encode(_pack_telemetry(PACKED_PROBE)).decode("ascii"),
+                    },
                     "source": self.app.args.source,
                     "target_fps": self.app.args.fps,
+                    "telemetry_hz": self.app.args.telemetry_hz,
                 }
             )
             return
@@ -577,6 +1586,12 @@ def parse_args() -> argparse.Namespace:
         help="MJPEG URL when --source mjpeg",
     )
     parser.add_argument("--camera-device", default="/dev/video0", help="V4L2 camera path")
+    parser.add_argument(
+        "--webcam-capture",
+        choices=("direct", "ffmpeg"),
+        default="ffmpeg",
+        help="Webcam capture path: always use ffmpeg, or read native MJPEG in-process (falls back to ffmpeg)",
+    )
     parser.add_argument("--video-file", default="", help="Video file when --source file")
     parser.add_argument("--width", type=int, default=1280)
     parser.add_argument("--height", type=int, default=720)
@@ -584,6 +1599,18 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--jpeg-quality", type=int, default=5, help="ffmpeg MJPEG q:v (2-31)")
     parser.add_argument("--telemetry-hz", type=int, default=30, help="Telemetry simulation rate")
     parser.add_argument("--sse-hz", type=int, default=20, help="SSE publish rate")
+    parser.add_argument(
+        "--sim-profile",
+        type=Path,
+        default=None,
+        help="JSON file overriding SIM_PROFILE constants of the telemetry simulator",
+    )
+    parser.add_argument(
+        "--telemetry-format",
+        choices=("json", "packed"),
+        default="json",
+        help="Wire format the dashboard requests for the telemetry stream",
+    )
     args = parser.parse_args()
 
     if args.source == "file" and not args.video_file:
@@ -592,6 +1619,23 @@ def parse_args() -> argparse.Namespace:
         parser.error(f"Video file not found: {args.video_file}")
     if args.source == "mjpeg" and not args.mjpeg_url:
         parser.error("--mjpeg-url is required when --source mjpeg")
+    if args.sim_profile is not None:
+        try:
+            overrides = json.loads(args.sim_profile.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            parser.error(f"Cannot read --sim-profile {args.sim_profile}: {exc}")
+        if not isinstance(overrides, dict):
+            parser.error("--sim-profile must contain a JSON object")
+        unknown = sorted(set(overrides) - set(SIM_PROFILE))
+        if unknown:
+            parser.error(f"Unknown --sim-profile keys: {', '.join(unknown)}")
+        # Values are pasted into generated source, where nan/inf would be undefined names.
+        if not all(
+            isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+            for value in overrides.values()
+        ):
+            parser.error("--sim-profile values must be finite numbers")
+        args.sim_profile = overrides
     return args
 
 
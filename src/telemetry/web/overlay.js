@@ -3,6 +3,8 @@ const state = {
   source: "unknown",
   cameraConnected: false,
   latest: null,
+  // Samples from the last batch event, each with the time it is due on screen.
+  queue: [],
   smooth: {
     speed: 0,
     rpm: 0,
@@ -157,7 +159,10 @@ function drawGMeter(gLat, gLong) {
   gCtx.stroke();
 }
 
-function renderHud() {
+function renderHud(now) {
+  while (state.queue.length && state.queue[0].due <= now) {
+    state.latest = state.queue.shift().sample;
+  }
   if (!state.latest) return;
   const t = state.latest;
 
@@ -215,7 +220,7 @@ function renderHud() {
 function renderFrame(now) {
   drawVideoFrame(mainCtx, dom.mainFeed, false);
   drawVideoFrame(insetCtx, dom.insetFeed, true);
-  renderHud();
+  renderHud(now);
 
   state.frameCount += 1;
   if (now - state.lastFpsTs >= 1000) {
@@ -227,11 +232,89 @@ function renderFrame(now) {
   requestAnimationFrame(renderFrame);
 }
 
-function connectTelemetry(url) {
+const GEARS = ["N", "1", "2", "3", "4", "5", "6"];
+const PACKED_NULL_U16 = 0xffff;
+const PACKED_NULL_I16 = -0x8000;
+
+function scaledOrNull(raw, nullValue, scale) {
+  return raw === nullValue ? null : raw / scale;
+}
+
+// Mirrors PACKED_TELEMETRY in race_overlay.py ("<HHBhhHHHIIIhHHHHHhH").
+const PACKED_RECORD_SIZE = 43;
+
+function decodePacked(v, o) {
+  return {
+    speed_mph: v.getUint16(o, true) / 10,
+    rpm: v.getUint16(o + 2, true),
+    gear: GEARS[v.getUint8(o + 4)] || "-",
+    g_lat: v.getInt16(o + 5, true) / 100,
+    g_long: v.getInt16(o + 7, true) / 100,
+    throttle: v.getUint16(o + 9, true) / 1000,
+    brake: v.getUint16(o + 11, true) / 1000,
+    lap: {
+      number: v.getUint16(o + 13, true),
+      current_time_s: v.getUint32(o + 15, true) / 1000,
+      last_time_s: v.getUint32(o + 19, true) / 1000,
+      best_time_s: v.getUint32(o + 23, true) / 1000,
+      predicted_delta_s: v.getInt16(o + 27, true) / 1000,
+      progress: v.getUint16(o + 29, true) / 10000,
+    },
+    track: { x: v.getUint16(o + 31, true) / 10000, y: v.getUint16(o + 33, true) / 10000 },
+    system: {
+      cpu_percent: scaledOrNull(v.getUint16(o + 35, true), PACKED_NULL_U16, 10),
+      gpu_percent: scaledOrNull(v.getUint16(o + 37, true), PACKED_NULL_U16, 10),
+      temp_c: scaledOrNull(v.getInt16(o + 39, true), PACKED_NULL_I16, 10),
+      mem_used_percent: scaledOrNull(v.getUint16(o + 41, true), PACKED_NULL_U16, 10),
+    },
+  };
+}
+
+// Each batch event carries one or more samples, oldest first.
+function decodePackedEvent(data) {
+  const bytes = Uint8Array.from(atob(data), (c) => c.charCodeAt(0));
+  const v = new DataView(bytes.buffer);
+  const samples = [];
+  for (let o = 0; o + PACKED_RECORD_SIZE <= bytes.length; o += PACKED_RECORD_SIZE) {
+    samples.push(decodePacked(v, o));
+  }
+  return samples;
+}
+
+// True when decodePacked() reproduces the server's reference sample, i.e. the
+// record layout here still matches PACKED_TELEMETRY in race_overlay.py.
+function matchesProbe(expected, actual) {
+  return Object.keys(expected).every((key) => {
+    const want = expected[key];
+    const got = actual[key];
+    if (want !== null && typeof want === "object") return got != null && matchesProbe(want, got);
+    if (typeof want === "number") return typeof got === "number" && Math.abs(got - want) < 1e-9;
+    return got === want;
+  });
+}
+
+function packedDecoderMatches(probe) {
+  if (!probe) return false;
+  const samples = decodePackedEvent(probe.data);
+  return samples.length === 1 && matchesProbe(probe.sample, samples[0]);
+}
+
+// Replays a batch at the producer's spacing, so every sample is shown in order
+// instead of only the newest.
+function queueSamples(samples, spacingMs) {
+  // Whatever the previous batch still holds is overdue now.
+  if (state.queue.length) state.latest = state.queue[state.queue.length - 1].sample;
+  const now = performance.now();
+  state.queue = samples.map((sample, i) => ({ due: now + i * spacingMs, sample }));
+}
+
+function connectTelemetry(url, format, telemetryHz) {
+  const decode = format === "packed" ? decodePackedEvent : JSON.parse;
+  const spacingMs = 1000 / Math.max(1, telemetryHz || 1);
   const stream = new EventSource(url);
-  stream.addEventListener("telemetry", (event) => {
+  stream.addEventListener("telemetry_batch", (event) => {
     state.connected = true;
-    state.latest = JSON.parse(event.data);
+    queueSamples(decode(event.data), spacingMs);
   });
   stream.onerror = () => {
     state.connected = false;
@@ -264,7 +347,12 @@ async function init() {
   dom.source.textContent = `${state.source.toUpperCase()} @ ${config.target_fps}FPS`;
 
   attachCamera(config.camera_url);
-  connectTelemetry(config.telemetry_url);
+  if (config.telemetry_format === "packed" && !packedDecoderMatches(config.packed_probe)) {
+    console.warn("Packed telemetry layout mismatch; using the JSON stream");
+    connectTelemetry("/api/telemetry/stream?batch=1", "json", config.telemetry_hz);
+  } else {
+    connectTelemetry(config.telemetry_url, config.telemetry_format, config.telemetry_hz);
+  }
   requestAnimationFrame(renderFrame);
 }
 